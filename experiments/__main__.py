@@ -119,9 +119,7 @@ async def main(args: Args):
                 if result is None:
                     any_err = True
                     continue
-                result_dict = asdict(result)
-                result_dict["qps"] = result.qps
-                writer(result_dict)
+                writer(asdict(result))
     except KeyboardInterrupt:
         pass
     if any_err:
@@ -4,16 +4,16 @@ import json
 import operator
 import subprocess
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from functools import reduce
 from pathlib import Path
-from subprocess import check_call, check_output
 from tempfile import TemporaryDirectory
-from typing import NewType, Dict, Any, List, Iterator
+from typing import NewType, Dict, Any, List, AsyncIterator
 
 from halo import Halo
 
 from experiments.system import System
+from experiments.util import check_call, check_output
 
 
 Region = NewType("Region", str)
@@ -33,8 +33,10 @@ def format_args(var_dict: Dict[str, Any]) -> List:
     return reduce(operator.add, [["-var", f"{k}={v}"] for k, v in var_dict.items()])
 
 
-@contextmanager
-def terraform(tf_vars: Dict[str, Any], tf_dir: Path) -> Iterator[Dict[Any, Any]]:
+@asynccontextmanager
+async def terraform(
+    tf_vars: Dict[str, Any], tf_dir: Path
+) -> AsyncIterator[Dict[Any, Any]]:
     if "AWS_ACCESS_KEY_ID" not in os.environ:
         raise RuntimeError("Missing AWS creds")
     with TemporaryDirectory() as tmpdir:
@@ -43,14 +45,16 @@ def terraform(tf_vars: Dict[str, Any], tf_dir: Path) -> Iterator[Dict[Any, Any]]
             tf_args = format_args(tf_vars)
             cmd = ["terraform", "plan", f"-out={plan}", "-no-color"] + tf_args
             try:
-                plan_output = check_output(cmd, stderr=subprocess.STDOUT, cwd=tf_dir)
+                plan_output = await check_output(
+                    cmd, stderr=subprocess.STDOUT, cwd=tf_dir
+                )
             except subprocess.CalledProcessError as err:
                 if "terraform init" in err.output.decode("utf8"):
                     # we know what to do here
                     spinner.text = "[infrastructure] initializing plugins"
-                    check_output(["terraform", "init"], cwd=tf_dir)
+                    await check_output(["terraform", "init"], cwd=tf_dir)
                     spinner.text = "[infrastructure] checking current state"
-                    plan_output = check_output(cmd, cwd=tf_dir)
+                    plan_output = await check_output(cmd, cwd=tf_dir)
                 elif "Your query returned no results" in err.output.decode("utf8"):
                     raise NoImageError() from err
                 else:
@@ -88,10 +92,11 @@ def terraform(tf_vars: Dict[str, Any], tf_dir: Path) -> Iterator[Dict[Any, Any]]
                         "-auto-approve",
                         str(plan),
                     ]
-                    check_call(cmd, stdout=log_file, cwd=tf_dir)
+                    await check_call(cmd, stdout=log_file, cwd=tf_dir)
                 spinner.succeed("[infrastructure] created")
 
-        data = json.loads(check_output(["terraform", "output", "-json"], cwd=tf_dir))
+        output = await check_output(["terraform", "output", "-json"], cwd=tf_dir)
+        data = json.loads(output)
     yield {k: v["value"] for k, v in data.items()}
 
 
@@ -103,7 +108,7 @@ def cleanup(system: System):
         tf_vars = system.environment.make_tf_cleanup_vars()
         tf_args = format_args(tf_vars)
         with Halo("[infrastructure] tearing down all resources") as spinner:
-            check_call(
+            subprocess.check_call(
                 ["terraform", "destroy", "-auto-approve"] + tf_args,
                 stdout=subprocess.DEVNULL,
                 cwd=system.root_dir,
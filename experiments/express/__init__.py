@@ -3,11 +3,11 @@ from __future__ import annotations
 import asyncio
 import re
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterator, Union, Tuple, ClassVar, Optional
+from typing import Any, AsyncIterator, Dict, Union, Tuple, Optional
 
 from halo import Halo
 
@@ -152,8 +152,8 @@ class Experiment(system.Experiment):
 class PackerConfig(system.PackerConfig):
     instance_type: InstanceType
 
-    @contextmanager
-    def make_packer_args(self) -> Iterator[Dict[str, str]]:
+    @asynccontextmanager
+    async def make_packer_args(self) -> AsyncIterator[Dict[str, str]]:
         yield {"instance_type": str(self.instance_type)}
 
     def matches(self, build: Dict[str, str]) -> bool:
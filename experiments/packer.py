@@ -4,7 +4,6 @@ import json
 
 from dataclasses import dataclass
 from operator import attrgetter
-from subprocess import check_call
 from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 
@@ -12,6 +11,7 @@ from halo import Halo
 
 from experiments.cloud import Region, AMI
 from experiments import cloud, system
+from experiments.util import check_call
 
 
 @dataclass
@@ -72,7 +72,7 @@ class Manifest:
         return None
 
 
-def ensure_ami_build(
+async def ensure_ami_build(
     config: system.PackerConfig,
     force_rebuilt: Optional[Set[system.PackerConfig]],
     packer_dir: Path,
@@ -90,12 +90,12 @@ def ensure_ami_build(
     if build is not None and not force_rebuild:
         return build
 
-    with config.make_packer_args() as args:
+    async with config.make_packer_args() as args:
         packer_vars = cloud.format_args(args)
         with open("packer.log", "w") as log_file:
             msg = f"[infrastructure] building AMI (output in [{log_file.name}])"
             with Halo(msg) as spinner:
-                check_call(
+                await check_call(
                     ["packer", "build"] + packer_vars + ["main.pkr.hcl"],
                     stdout=log_file,
                     cwd=packer_dir,
@@ -4,11 +4,11 @@ import asyncio
 import math
 import re
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterator, Union, Tuple, ClassVar, List, Optional
+from typing import Any, AsyncIterator, Dict, Union, Tuple, List, Optional
 
 from halo import Halo
 
@@ -263,8 +263,8 @@ class Experiment(system.Experiment):
 class PackerConfig(system.PackerConfig):
     instance_type: InstanceType
 
-    @contextmanager
-    def make_packer_args(self) -> Iterator[Dict[str, str]]:
+    @asynccontextmanager
+    async def make_packer_args(self) -> AsyncIterator[Dict[str, str]]:
         yield {"instance_type": str(self.instance_type)}
 
     def matches(self, build: Dict[str, str]) -> bool:
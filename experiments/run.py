@@ -5,9 +5,9 @@ import asyncio
 import contextlib
 import traceback
 
-from contextlib import asynccontextmanager, nullcontext, contextmanager
+from contextlib import asynccontextmanager, nullcontext
 from dataclasses import dataclass
-from typing import Optional, Set, List, Any, AsyncIterator, Dict, Iterator
+from typing import Optional, Set, List, Any, AsyncIterator, Dict
 
 
 import asyncssh
@@ -31,6 +31,10 @@ from experiments.util import Hostname, gather_dict
 
 MAX_ATTEMPTS = 5
 
+# Connections are held open for every experiment in an environment; keep them
+# from being dropped as idle between experiments.
+SSH_KEEPALIVE_INTERVAL = 30
+
 
 @asynccontextmanager
 async def _connect_ssh(hostname: Hostname, *args, **kwargs) -> AsyncIterator[Machine]:
@@ -43,6 +47,10 @@ async def _connect_ssh(hostname: Hostname, *args, **kwargs) -> AsyncIterator[Mac
     - yields a Machine instead of just connections: a nice wrapper of the
       connection with a hostname
     - retries until the machine is ready
+
+    The connection stays open for as long as the context is held, so every
+    command for this machine multiplexes a channel over it rather than
+    reconnecting.
     """
 
     reraise_err = None
@@ -63,28 +71,30 @@ async def _connect_ssh(hostname: Hostname, *args, **kwargs) -> AsyncIterator[Mac
         raise reraise_err from None
 
 
-@contextmanager
-def packer_and_tf(
+@asynccontextmanager
+async def packer_and_tf(
     environment: Environment,
     system: System,
     force_rebuilt: Optional[Set[Any]],
     build_args: BuildArgs,
-) -> Iterator[Dict[Any, Any]]:
+) -> AsyncIterator[Dict[Any, Any]]:
     packer_config = system.packer_config.from_args(build_args, environment)
 
     if force_rebuilt is not None:
-        build = packer.ensure_ami_build(packer_config, force_rebuilt, system.root_dir)
+        build = await packer.ensure_ami_build(
+            packer_config, force_rebuilt, system.root_dir
+        )
     else:
         build = None
     tf_vars = environment.make_tf_vars(build, build_args)
     try:
-        with cloud.terraform(tf_vars, system.root_dir) as data:
+        async with cloud.terraform(tf_vars, system.root_dir) as data:
             yield data
     except cloud.NoImageError:
         Halo("[infrastructure] no image found; forcing build").info()
-        build = packer.ensure_ami_build(packer_config, set(), system.root_dir)
+        build = await packer.ensure_ami_build(packer_config, set(), system.root_dir)
         tf_vars = environment.make_tf_vars(build, build_args)
-        with cloud.terraform(tf_vars, system.root_dir) as data:
+        async with cloud.terraform(tf_vars, system.root_dir) as data:
             yield data
 
 
@@ -110,7 +120,7 @@ async def deployed(
     """
     Halo(f"[infrastructure] {environment}").stop_and_persist(symbol="•")
 
-    with packer_and_tf(environment, system, force_rebuilt, build_args) as data:
+    async with packer_and_tf(environment, system, force_rebuilt, build_args) as data:
         ssh_key = asyncssh.import_private_key(data["private_key"])
 
         # The "stack" bit is so that we can have an async context manager that,
@@ -124,6 +134,17 @@ async def deployed(
                         known_hosts=None,
                         client_keys=[ssh_key],
                         username="ubuntu",
+                        # We only ever authenticate with the Terraform key.
+                        preferred_auth="publickey",
+                        keepalive_interval=SSH_KEEPALIVE_INTERVAL,
+                        # Our traffic is short commands and small logs; compressing
+                        # it just costs CPU.
+                        compression_algs=None,
+                        # AES-GCM has hardware support on both ends; ChaCha20 doesn't.
+                        encryption_algs=[
+                            "aes128-gcm@openssh.com",
+                            "aes256-gcm@openssh.com",
+                        ],
                     )
                 )
             with Halo("[infrastructure] connecting (SSH) to all machines") as spinner:
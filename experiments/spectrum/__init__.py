@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import math
+import os
+import random
 import re
 
 from abc import ABC, abstractmethod
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from itertools import chain, starmap, product
-from operator import attrgetter
+from itertools import starmap
 from pathlib import Path
-from subprocess import check_call
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from tempfile import TemporaryDirectory
 from typing import (
+    ClassVar,
     NewType,
     Dict,
     Any,
@@ -20,22 +20,19 @@ from typing import (
     Type,
     List,
     Mapping,
-    Iterator,
+    AsyncIterator,
+    Awaitable,
     Union,
     Tuple,
 )
-from statistics import mean
-
-import asyncssh
 
 from halo import Halo
-from tenacity import stop_after_attempt, wait_fixed, AsyncRetrying
 
 from experiments import system, packer
 
 from experiments.system import Result, Machine, Milliseconds
 from experiments.cloud import DEFAULT_INSTANCE_TYPE, InstanceType, SHA, AWS_REGION
-from experiments.util import Bytes
+from experiments.util import Bytes, check_call
 
 BuildProfile = NewType("BuildProfile", str)
 
@@ -45,6 +42,24 @@ MAX_WORKERS_PER_MACHINE = 10
 
 EXPERIMENT_TIMEOUT = 60.0
 
+# Stage the source archive for Packer in memory-backed storage when we can.
+_TMPFS_DIR: Optional[str] = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# A worker's periodic progress line, as output by `journalctl --output with-unit`.
+# Only the unit prefix and the end of the line are pinned down; what comes in
+# between depends on the worker's logger (it may color the level, say).
+_TIMING_RE = re.compile(
+    rb"(spectrum-worker@[0-9]+)\.service\[[0-9]+\]: "
+    rb".*\b([0-9]+) clients processed in time ([0-9]+)ms \([0-9]+ qps\)$",
+    re.MULTILINE,
+)
+
+# Cap on simultaneous shutdown commands, so large fleets don't open a burst of
+# SSH channels all at once.
+MAX_CONCURRENT_SHUTDOWNS = 32
+# How long one host gets to stop its units before we give up on it (seconds).
+SHUTDOWN_TIMEOUT = 10.0
+
 
 @dataclass
 class Setting(system.Setting):
@@ -67,45 +82,62 @@ class Setting(system.Setting):
     @classmethod
     def from_dict(cls, machines: Dict[Any, Machine]) -> Setting:
         publisher = None
-        workers = []
-        clients = []
+        # Keyed by index: group assignment depends on worker order. `machines`
+        # comes in `to_machine_spec` order today (gather_dict preserves it), but
+        # that's an accident of how the dict is built, not a contract.
+        workers: Dict[int, Machine] = {}
+        clients: Dict[int, Machine] = {}
         for ident, machine in machines.items():
             if ident == "publisher":
                 publisher = machine
             elif ident[0] == "worker":
-                workers.append(machine)
+                workers[ident[1]] = machine
             elif ident[0] == "client":
-                clients.append(machine)
+                clients[ident[1]] = machine
             else:
                 raise ValueError(f"Invalid identifier [{ident}]")
         if publisher is None:
             raise ValueError("Missing publisher.")
-        return cls(publisher=publisher, workers=workers, clients=clients)
+        return cls(
+            publisher=publisher,
+            workers=[workers[idx] for idx in sorted(workers)],
+            clients=[clients[idx] for idx in sorted(clients)],
+        )
 
     async def additional_setup(self):
         with Halo("[infrastructure] starting etcd") as spinner:
-            await self.publisher.ssh.run(
-                f"HOSTNAME={self.publisher.hostname} "
-                "envsubst '$HOSTNAME' "
-                '    < "$HOME/config/etcd.template" '
-                "    | sudo tee /etc/default/etcd "
-                "    > /dev/null",
+            await _run_script(
+                self.publisher,
+                [
+                    f"HOSTNAME={self.publisher.hostname} "
+                    "envsubst '$HOSTNAME' "
+                    '    < "$HOME/config/etcd.template" '
+                    "    | sudo tee /etc/default/etcd "
+                    "    > /dev/null",
+                    "sudo systemctl restart etcd",
+                ],
                 check=True,
             )
-            await self.publisher.ssh.run("sudo systemctl restart etcd", check=True)
-            # Make sure etcd is healthy
-            async for attempt in AsyncRetrying(
-                wait=wait_fixed(2), stop=stop_after_attempt(20)
-            ):
-                with attempt:
-                    await self.publisher.ssh.run(
-                        (
-                            "ETCDCTL_API=3 etcdctl "
-                            f"--endpoints {self.publisher.hostname}:2379 "
-                            "endpoint health"
-                        ),
-                        check=True,
-                    )
+            # Make sure etcd is healthy. Port 2379 is only open to machines in
+            # the cluster (see modules/secgroup), so talk to it via the publisher.
+            # Jittered exponential backoff: 50ms at first, capped at 8s.
+            backoff = 0.05
+            for attempt in range(30):
+                if attempt:  # back off between attempts, not after the last one
+                    await asyncio.sleep(random.uniform(0, backoff))
+                    backoff = min(2 * backoff, 8)
+                health = await self.publisher.ssh.run(
+                    (
+                        "ETCDCTL_API=3 etcdctl "
+                        f"--endpoints {self.publisher.hostname}:2379 "
+                        "endpoint health"
+                    ),
+                    check=False,
+                )
+                if health.exit_status == 0:
+                    break
+            else:
+                raise RuntimeError(f"etcd never became healthy: {health.stderr}")
             spinner.succeed("[infrastructure] etcd healthy")
 
 
@@ -143,11 +175,23 @@ class Environment(system.Environment):
 
 
 class Protocol(ABC):
+    # Populated as subclasses are defined; keyed by class name.
+    _registry: ClassVar[Dict[str, Type[Protocol]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Protocol._registry[cls.__name__] = cls
+
     @property
     @abstractmethod
     def flag(self) -> str:
         ...
 
+    @property
+    @abstractmethod
+    def groups(self) -> int:
+        ...
+
     @classmethod
     @abstractmethod
     def _from_dict(cls, data: Dict[str, Any]) -> Protocol:
@@ -155,15 +199,16 @@ class Protocol(ABC):
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> Protocol:
-        assert len(data) == 1
-        key = next(iter(data.keys()))
-        subclasses = {cls.__name__: cls for cls in Protocol.__subclasses__()}
-        subcls: Optional[Type[Protocol]] = subclasses.get(key, None)
+        if len(data) != 1:
+            raise ValueError(f"Expected exactly one protocol, got {data}")
+        ((key, params),) = data.items()
+        subcls: Optional[Type[Protocol]] = Protocol._registry.get(key, None)
         if subcls is None:
             raise ValueError(
-                f"Invalid protocol {data}. Expected one of {list(subclasses.keys())}."
+                f"Invalid protocol {data}. "
+                f"Expected one of {list(Protocol._registry.keys())}."
             )
-        return subcls._from_dict(data[key])  # pylint: disable=protected-access
+        return subcls._from_dict(params)  # pylint: disable=protected-access
 
 
 @dataclass(frozen=True)
@@ -174,6 +219,10 @@ class Symmetric(Protocol):
     def flag(self) -> str:
         return f"--security {self.security}"
 
+    @property
+    def groups(self) -> int:
+        return 2
+
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> Symmetric:
         return cls(**data)
@@ -187,6 +236,10 @@ class Insecure(Protocol):
     def flag(self) -> str:
         return "--no-security"
 
+    @property
+    def groups(self) -> int:
+        return self.parties
+
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> Insecure:
         return cls(**data)
@@ -200,19 +253,38 @@ class SeedHomomorphic(Protocol):
     def flag(self) -> str:
         return "--security-multi-key 16"
 
+    @property
+    def groups(self) -> int:
+        return self.parties
+
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> SeedHomomorphic:
         return cls(**data)
 
 
-async def _install_spectrum_config(machine: Machine, spectrum_config: Dict[str, Any]):
-    spectrum_config_str = "\n".join([f"{k}={v}" for k, v in spectrum_config.items()])
-    with NamedTemporaryFile() as tmp:
-        tmp.write(spectrum_config_str.encode("utf8"))
-        tmp.flush()
-        await asyncssh.scp(tmp.name, (machine.ssh, "/tmp/spectrum.conf"))
+async def _run_script(machine: Machine, commands: List[str], **kwargs):
+    """Run `commands` in order on `machine` over a single SSH channel.
+
+    The commands are fed to `bash -e -o pipefail` on stdin, so the first failure
+    (including within a pipeline) stops the script (and raises, with `check=True`).
+    """
+    return await machine.ssh.run(
+        "bash -e -o pipefail", input="\n".join(commands), **kwargs
+    )
+
+
+def _format_spectrum_config(spectrum_config: Mapping[str, Any]) -> str:
+    """Render `spectrum_config` as the contents of an `EnvironmentFile`."""
+    return "\n".join([f"{k}={v}" for k, v in spectrum_config.items()])
+
+
+async def _install_spectrum_config(machine: Machine, spectrum_config_str: str):
+    """Install pre-rendered config (see `_format_spectrum_config`) on `machine`."""
+    # Pipe the config over stdin: one round trip, no local temp file.
     await machine.ssh.run(
-        "sudo install -m 644 /tmp/spectrum.conf /etc/spectrum.conf", check=True
+        "sudo install -m 644 /dev/stdin /etc/spectrum.conf",
+        input=spectrum_config_str,
+        check=True,
     )
 
 
@@ -222,7 +294,13 @@ async def _prepare_worker(
     worker_start_idx: int,
     num_workers: int,
     etcd_env: Mapping[str, str],
-):
+    experiment_ready: Awaitable[Any],
+) -> str:
+    """Start the worker processes on `machine`.
+
+    Returns the time (on `machine`'s clock, in `journalctl --since` format) just
+    before they started.
+    """
     spectrum_config: Dict[str, Any] = {
         "SPECTRUM_WORKER_GROUP": group,
         "SPECTRUM_WORKER_START_INDEX": worker_start_idx,
@@ -231,30 +309,35 @@ async def _prepare_worker(
         "SPECTRUM_TLS_CERT": "/home/ubuntu/spectrum/data/server.crt",
         **etcd_env,
     }
-    await _install_spectrum_config(machine, spectrum_config)
-
-    # don't let this same output confuse us if we run on this machine again
-    await machine.ssh.run(
-        "sudo journalctl --rotate && sudo journalctl --vacuum-time=1s",
+    await _install_spectrum_config(machine, _format_spectrum_config(spectrum_config))
+
+    await experiment_ready
+    result = await _run_script(
+        machine,
+        [
+            "date +@%s",
+            f"sudo systemctl start spectrum-worker@{{1..{num_workers}}}",
+        ],
         check=True,
     )
-
-    await machine.ssh.run(
-        f"sudo systemctl start spectrum-worker@{{1..{num_workers}}}", check=True
-    )
+    return result.stdout.strip()
 
 
 async def _prepare_client(
-    machine: Machine, client_range: slice, etcd_env: Dict[str, Any]
+    machine: Machine,
+    start: int,
+    stop: int,
+    config_str: str,
+    experiment_ready: Awaitable[Any],
 ):
-    spectrum_config: Dict[str, Any] = {
-        "SPECTRUM_TLS_CA": "/home/ubuntu/spectrum/data/ca.crt",
-        **etcd_env,
-    }
-    await _install_spectrum_config(machine, spectrum_config)
+    """Start viewers `start` through `stop` (inclusive, 1-indexed) on `machine`.
+
+    `config_str` is the same for every client, so the caller renders it once.
+    """
+    await _install_spectrum_config(machine, config_str)
+    await experiment_ready
     await machine.ssh.run(
-        f"sudo systemctl start viewer@{{{client_range.start}..{client_range.stop}}}",
-        check=True,
+        f"sudo systemctl start viewer@{{{start}..{stop}}}", check=True
     )
 
 
@@ -271,28 +354,22 @@ class Experiment(system.Experiment):
 
     @property
     def groups(self) -> int:
-        if isinstance(self.protocol, Symmetric):
-            return 2
-        if isinstance(self.protocol, Insecure):
-            return self.protocol.parties
-        if isinstance(self.protocol, SeedHomomorphic):
-            return self.protocol.parties
-        raise TypeError(
-            f"Invalid protocol {self.protocol}. "
-            "Expected one of Symmetric, Insecure, SeedHomomorphic"
-        )
+        return self.protocol.groups
 
     @property
     def group_size(self) -> int:
         return self.workers_per_machine * self.worker_machines_per_group
 
+    @property
+    def client_machines(self) -> int:
+        return -(-self.clients // self.clients_per_machine)  # ceiling division
+
     def to_environment(self) -> Environment:
-        client_machines = math.ceil(self.clients / self.clients_per_machine)
         worker_machines = self.worker_machines_per_group * self.groups
         return Environment(
             instance_type=self.instance_type,
             worker_machines=worker_machines,
-            client_machines=client_machines,
+            client_machines=self.client_machines,
         )
 
     @classmethod
@@ -300,45 +377,43 @@ class Experiment(system.Experiment):
         protocol = data.pop("protocol", None)
         if protocol is not None:
             data["protocol"] = Protocol.from_dict(protocol)
-        return cls(**data)
+        experiment = cls(**data)
+        if experiment.clients < 1:
+            raise ValueError(f"Need at least one client (got {experiment.clients}).")
+        return experiment
 
-    async def _fetch_timing(self, worker: Machine) -> Optional[Result]:
-        """Timing for one worker.
+    async def _fetch_timing(self, worker: Machine, since: str) -> Optional[Result]:
+        """Timing for one worker, from its logs since `since`.
 
         We look across all worker processes and get the best intermediate result from each.
         We then report the *total* QPS.
         """
+        # One journal read for every worker process on this machine; the unit
+        # name on each line tells us which process it came from. Starting from
+        # `since` means output from earlier runs on this machine can't confuse us.
+        # Workers log at debug level (every upload, plus their keys), so filter
+        # remotely rather than shipping the whole journal; _TIMING_RE then picks
+        # out the fields.
+        cmd_result = await worker.ssh.run(
+            "journalctl --unit 'spectrum-worker@*' --all --output with-unit"
+            f" --since {since} | grep --fixed-strings 'clients processed in time'",
+            encoding=None,  # we only need the digits, so skip decoding the log
+        )
+        # Best (qps, time) so far for each worker process.
+        best: Dict[bytes, Tuple[int, Milliseconds]] = {}
+        for unit, clients, time in _TIMING_RE.findall(cmd_result.stdout):
+            qps = int((int(clients) / int(time)) * 1000)  # as in Result.qps
+            if unit not in best or qps > best[unit][0]:
+                best[unit] = (qps, Milliseconds(int(time)))
+
         total_qps = 0
         max_time = None
-        for worker_process in range(1, self.workers_per_machine + 1):
-            cmd_result = await worker.ssh.run(
-                f"journalctl --unit spectrum-worker@{worker_process}"
-                r"    | grep -Eo '[0-9]+ clients processed in time [0-9]+ms \([0-9]+ qps\)'",
-            )
-            process_results = []
-            for line in cmd_result.stdout.split("\n"):
-                match = re.match(
-                    r"([0-9]+) clients processed in time ([0-9]+)ms \([0-9]+ qps\)",
-                    line,
-                )
-                if not match:
-                    continue
-                clients, time = match.groups()
-                process_results.append(
-                    Result(
-                        experiment=self,
-                        queries=int(clients),
-                        time=Milliseconds(int(time)),
-                    )
-                )
-            if not process_results:
-                continue
-            best_result = max(process_results, key=attrgetter("qps"))
-            total_qps += best_result.qps
+        for qps, time in best.values():
+            total_qps += qps
             if max_time is None:
-                max_time = best_result.time
+                max_time = time
             else:
-                max_time = max(max_time, best_result.time)
+                max_time = max(max_time, time)
         if max_time is None:
             return None
         result = Result(
@@ -350,21 +425,59 @@ class Experiment(system.Experiment):
         return result
 
     async def _execute_experiment(
-        self, publisher: Machine, workers: List[Machine], etcd_env: Dict[str, Any]
+        self, publisher: Machine, workers: List[Machine], worker_start_times: List[str]
     ) -> Result:
-        await _install_spectrum_config(publisher, etcd_env)
         timeout = EXPERIMENT_TIMEOUT - 10  # give some cleanup time
         await publisher.ssh.run("sudo systemctl start spectrum-publisher", check=True)
-        await asyncio.sleep(timeout)
+        # Worker throughput is reported cumulatively, so we want the whole
+        # window--unless the publisher exits early (e.g., it crashed), in which
+        # case the trial has failed and there's no point waiting it out.
+        # If it did exit, report why (e.g. "exit-code", "signal") for the error log;
+        # retry_experiment takes care of retrying with a fresh setup.
+        waited = await publisher.ssh.run(
+            f"timeout {int(timeout)} sh -c "
+            "'while systemctl is-active --quiet spectrum-publisher; do sleep 1; done'"
+            " && systemctl show --property Result --value spectrum-publisher",
+            check=False,
+        )
+        if waited.exit_status == 0:
+            raise RuntimeError(
+                "Publisher exited before the experiment finished "
+                f"(result: {waited.stdout.strip()})."
+            )
+        if waited.exit_status != 124:  # `timeout` exits with 124 if time ran out
+            # Not a verdict on the publisher: the wait itself broke (SSH dropped,
+            # `systemctl show` failed, ...), so we don't know whether the window ran.
+            raise RuntimeError(
+                "Couldn't wait for the publisher "
+                f"(exit status {waited.exit_status}): {waited.stderr}"
+            )
 
-        results = await asyncio.gather(*map(self._fetch_timing, workers))
-        results = list(filter(None, results))
-        if not results:
+        # We get the total QPS per machine; aggregate as each one comes in.
+        fetches = [
+            asyncio.create_task(self._fetch_timing(worker, since))
+            for worker, since in zip(workers, worker_start_times)
+        ]
+        total_qps = 0
+        min_time = None
+        try:
+            for fetch in asyncio.as_completed(fetches):
+                result = await fetch
+                if result is None:
+                    continue
+                total_qps += result.qps
+                if min_time is None or result.time < min_time:
+                    min_time = result.time
+        finally:
+            # If one fetch failed, don't leave the rest running (and their
+            # exceptions unretrieved) behind us.
+            for fetch in fetches:
+                fetch.cancel()
+            await asyncio.gather(*fetches, return_exceptions=True)
+        if min_time is None:
             raise RuntimeError("No successful runs.")
-        # We now have the total QPS per machine; let's aggregate.
         # Divide by self.groups so we don't double-count.
-        total_qps = sum(map(attrgetter("qps"), results)) / self.groups
-        min_time = min(map(attrgetter("time"), results))
+        total_qps /= self.groups
         return Result(
             experiment=self,
             time=min_time,
@@ -372,6 +485,8 @@ class Experiment(system.Experiment):
         )
 
     async def run(self, setting: Setting, spinner: Halo) -> Result:
+        # Everything we start before the experiment proper; see `finally`.
+        setup_tasks: List[asyncio.Task] = []
         try:
             publisher = setting.publisher
             workers = setting.workers
@@ -381,18 +496,13 @@ class Experiment(system.Experiment):
             etcd_env = {"SPECTRUM_CONFIG_SERVER": etcd_url}
 
             spinner.text = "[experiment] setting up"
-            # don't let this same output confuse us if we run on this machine again
-            await publisher.ssh.run(
-                "sudo journalctl --rotate && sudo journalctl --vacuum-time=1s",
-                check=True,
-            )
-            # ensure a blank slate
-            await publisher.ssh.run(
-                "ETCDCTL_API=3 etcdctl --endpoints localhost:2379 del --prefix ''",
-                check=True,
-            )
-            # can't use ssh.run(env=...) because the SSH server doesn't like it.
-            await publisher.ssh.run(
+            # We don't read their stdout, so don't ship it back; stderr still
+            # comes back for error reporting.
+            setup_cmds = [
+                # ensure a blank slate
+                "ETCDCTL_API=3 etcdctl --endpoints localhost:2379 del --prefix ''"
+                "    > /dev/null",
+                # can't use ssh.run(env=...) because the SSH server doesn't like it.
                 f"SPECTRUM_CONFIG_SERVER={etcd_url} "
                 "/home/ubuntu/spectrum/setup"
                 f"    {self.protocol.flag}"
@@ -401,69 +511,108 @@ class Experiment(system.Experiment):
                 f"    --clients {self.clients}"
                 f"    --group-size {self.group_size}"
                 f"    --groups {self.groups}"
-                f"    --message-size {self.message_size}",
-                check=True,
-                timeout=15,
+                f"    --message-size {self.message_size}"
+                "    > /dev/null",
+            ]
+            # Workers and viewers read the experiment from etcd as they start, so
+            # they can't start until setup is done; anything else can overlap it.
+            experiment_ready = asyncio.create_task(
+                _run_script(publisher, setup_cmds, check=True, timeout=15)
             )
+            setup_tasks.append(experiment_ready)
 
-            spinner.text = "[experiment] starting workers and clients"
             assert self.workers_per_machine <= MAX_WORKERS_PER_MACHINE
-            await asyncio.gather(
-                *[
-                    _prepare_worker(
-                        worker,
-                        group + 1,
-                        machine_idx * self.workers_per_machine,
-                        self.workers_per_machine,
-                        etcd_env,
+            # Worker i is machine (i // groups) within group (i % groups).
+            worker_preps = []
+            for idx, worker in enumerate(workers):
+                machine_idx, group = divmod(idx, self.groups)
+                worker_preps.append(
+                    asyncio.create_task(
+                        _prepare_worker(
+                            worker,
+                            group + 1,
+                            machine_idx * self.workers_per_machine,
+                            self.workers_per_machine,
+                            etcd_env,
+                            experiment_ready,
+                        )
                     )
-                    for (machine_idx, group), worker in zip(
-                        product(
-                            range(self.worker_machines_per_group), range(self.groups)
-                        ),
-                        workers,
-                    )
-                ]
-            )
+                )
+            setup_tasks.extend(worker_preps)
 
             # Full client count at every machine except the last
             cpm = self.clients_per_machine
-            client_counts = starmap(
-                slice,
-                zip(
-                    range(1, self.clients, cpm),
-                    chain(range(cpm, self.clients, cpm), [self.clients]),
-                ),
+            client_ranges = [
+                (idx * cpm + 1, min((idx + 1) * cpm, self.clients))
+                for idx in range(self.client_machines)
+            ]
+            client_config = _format_spectrum_config(
+                {"SPECTRUM_TLS_CA": "/home/ubuntu/spectrum/data/ca.crt", **etcd_env}
             )
-            await asyncio.gather(
-                *[
-                    _prepare_client(client, client_range, etcd_env)
-                    for client, client_range in zip(clients, client_counts)
-                ]
+            for client, (start, stop) in zip(clients, client_ranges):
+                setup_tasks.append(
+                    asyncio.create_task(
+                        _prepare_client(
+                            client, start, stop, client_config, experiment_ready
+                        )
+                    )
+                )
+
+            publisher_config = _format_spectrum_config(etcd_env)
+            setup_tasks.append(
+                asyncio.create_task(
+                    _install_spectrum_config(publisher, publisher_config)
+                )
             )
 
+            # Viewers wait for the publisher to set a start time, not for the
+            # workers, so both can be brought up at once. The publisher only
+            # needs its config in place before it starts.
+            await asyncio.gather(*setup_tasks)
+            worker_start_times = [prep.result() for prep in worker_preps]
+
             spinner.text = "[experiment] running"
             return await asyncio.wait_for(
-                self._execute_experiment(publisher, workers, etcd_env),
+                self._execute_experiment(publisher, workers, worker_start_times),
                 timeout=EXPERIMENT_TIMEOUT,
             )
         finally:
             spinner.text = "[experiment] shutting everything down"
-            shutdowns = []
+            # gather() doesn't cancel the rest when one fails. Make sure nothing
+            # from this attempt can still start units (or rerun setup) after we
+            # stop them below, or while the next attempt sets up.
+            for task in setup_tasks:
+                task.cancel()
+            await asyncio.gather(*setup_tasks, return_exceptions=True)
+            # One stop command per host.
+            stop_cmds = [(publisher, "sudo systemctl stop spectrum-publisher")]
             for worker in workers:
-                shutdowns.append(
-                    worker.ssh.run(
-                        "sudo systemctl stop 'spectrum-worker@*'", check=False
-                    )
-                )
+                stop_cmds.append((worker, "sudo systemctl stop 'spectrum-worker@*'"))
             for client in clients:
-                shutdowns.append(
-                    client.ssh.run("sudo systemctl stop 'viewer@*'", check=False)
-                )
-            shutdowns.append(
-                publisher.ssh.run("sudo systemctl stop spectrum-publisher", check=False)
+                stop_cmds.append((client, "sudo systemctl stop 'viewer@*'"))
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SHUTDOWNS)
+
+            async def _stop(machine: Machine, cmd: str):
+                async with semaphore:
+                    await asyncio.wait_for(
+                        machine.ssh.run(cmd, check=False), timeout=SHUTDOWN_TIMEOUT
+                    )
+
+            stops = await asyncio.gather(
+                *starmap(_stop, stop_cmds), return_exceptions=True
             )
-            await asyncio.gather(*shutdowns)
+            # Only report these: raising here would replace the trial's result (or
+            # the error it failed with). A timed-out stop may still be running on
+            # the host; we just stopped waiting for it.
+            failed = [
+                f"{machine.hostname} ({err!r})"
+                for (machine, _), err in zip(stop_cmds, stops)
+                if err is not None
+            ]
+            if failed:
+                spinner.warn(
+                    "[experiment] couldn't confirm shutdown on: " + ", ".join(failed)
+                )
 
 
 @dataclass(frozen=True)
@@ -473,17 +622,24 @@ class PackerConfig(system.PackerConfig):
     profile: BuildProfile
     instance_type: InstanceType
 
-    @contextmanager
-    def make_packer_args(self) -> Iterator[Dict[str, str]]:
-        with TemporaryDirectory() as tmpdir:
+    @asynccontextmanager
+    async def make_packer_args(self) -> AsyncIterator[Dict[str, str]]:
+        with TemporaryDirectory(dir=_TMPFS_DIR) as tmpdir:
             src_path = Path(tmpdir) / "spectrum-src.tar.gz"
-            cmd = (
-                "git archive --format tar.gz".split(" ")
-                + ["--output", str(src_path)]
-                + "--prefix spectrum/".split(" ")
-                + [str(self.sha)]
+            await check_call(
+                [
+                    "git",
+                    "archive",
+                    "--format",
+                    "tar.gz",
+                    "--output",
+                    str(src_path),
+                    "--prefix",
+                    "spectrum/",
+                    self.sha,
+                ],
+                cwd=self.git_root,
             )
-            check_call(cmd, cwd=self.git_root)
 
             yield {
                 "sha": self.sha,
@@ -5,9 +5,33 @@ import json
 import os
 import tempfile
 
+from pathlib import Path
 from subprocess import check_output, check_call, CalledProcessError
 
 
+def _terraform_output(tf_dir: Path) -> dict:
+    """`terraform output -json`, cached until the Terraform state changes.
+
+    The cache lives in Terraform's own `.terraform` directory. It includes the
+    private key, so it's only readable by us.
+    """
+    state = tf_dir / "terraform.tfstate"
+    cache = tf_dir / ".terraform" / "output.json"
+    try:
+        if cache.stat().st_mtime >= state.stat().st_mtime:
+            return json.loads(cache.read_bytes())
+    except FileNotFoundError:
+        pass
+    output = check_output(["terraform", "output", "-json"], cwd=tf_dir)
+    if cache.parent.is_dir():
+        # Write-then-rename so a concurrent invocation never reads half a file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache.parent)
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(output)
+        os.replace(tmp_path, cache)
+    return json.loads(output)
+
+
 def main(argv):
     parser = argparse.ArgumentParser(
         prog=argv[0], description="SSH into a Terraform machine."
@@ -38,8 +62,8 @@ def main(argv):
         extra = []
     args = parser.parse_args(argv[1:])
 
-    cwd = os.path.dirname(__file__)  # terraform needs to be in *this* directory
-    data = json.loads(check_output(["terraform", "output", "-json"], cwd=cwd))
+    # terraform needs to be in *this* directory
+    data = _terraform_output(Path(__file__).resolve().parent)
     data = {k: v["value"] for k, v in data.items()}
 
     if args.client is not None:
@@ -49,6 +73,11 @@ def main(argv):
     else:
         hostname = data["publisher"]
 
+    # Share one connection per host across invocations (see ssh_config(5)); %C is
+    # a hash, since EC2 hostnames can overflow the socket path length limit.
+    control_dir = Path.home() / ".ssh"
+    control_dir.mkdir(mode=0o700, exist_ok=True)
+
     try:
         with tempfile.NamedTemporaryFile() as key_file:
             key_file.write(data["private_key"].encode("utf8"))
@@ -62,6 +91,12 @@ def main(argv):
                     f"ubuntu@{hostname}",
                     "-o",
                     "StrictHostKeyChecking=no",
+                    "-o",
+                    "ControlMaster=auto",
+                    "-o",
+                    "ControlPersist=10m",
+                    "-o",
+                    f"ControlPath={control_dir}/spectrum-%C",
                 ]
                 + extra
             )
@@ -57,10 +57,9 @@ from __future__ import annotations
 import io
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from itertools import groupby
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, NewType, Tuple, Any, ContextManager, Dict, Type, Protocol
+from typing import List, NewType, Tuple, Any, AsyncContextManager, Dict, Type, Protocol
 
 import asyncssh
 
@@ -133,10 +132,11 @@ class Result:
     experiment: Experiment
     time: Milliseconds
     queries: int
+    qps: int = field(init=False)
 
-    @property
-    def qps(self) -> int:
-        return int((self.queries / self.time) * 1000)
+    def __post_init__(self):
+        # Frozen, so we can't assign this the usual way.
+        object.__setattr__(self, "qps", int((self.queries / self.time) * 1000))
 
 
 class Experiment(ABC):
@@ -170,12 +170,13 @@ class Experiment(ABC):
 
 class PackerConfig(ABC):
     @abstractmethod
-    def make_packer_args(self) -> ContextManager[Dict[str, str]]:
+    def make_packer_args(self) -> AsyncContextManager[Dict[str, str]]:
         """Yields the variables that should be passed on the command line to Packer.
 
         They will be formatted separately.
 
-        Needs to be a context manager in case we need temp files.
+        Needs to be a context manager in case we need temp files, and async in
+        case producing them means running a subprocess.
         """
         ...
 
@@ -223,6 +224,8 @@ class Args(ABC):
 def group_by_environment(
     experiments: List[Experiment],
 ) -> List[Tuple[Environment, List[Experiment]]]:
-    experiments = sorted(experiments, key=lambda e: e.to_environment())
-    by_environment = groupby(experiments, lambda e: e.to_environment())
-    return [(k, list(v)) for k, v in by_environment]
+    by_environment: Dict[Environment, List[Experiment]] = {}
+    for experiment in experiments:
+        by_environment.setdefault(experiment.to_environment(), []).append(experiment)
+    # Sorted, so that we deploy environments in a predictable order.
+    return sorted(by_environment.items(), key=lambda item: item[0])
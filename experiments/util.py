@@ -5,6 +5,7 @@ about how to organize your code.
 """
 import asyncio
 import json
+import subprocess
 
 from contextlib import contextmanager, closing, nullcontext
 from typing import (
@@ -17,6 +18,7 @@ from typing import (
     NewType,
     TypeVar,
     Awaitable,
+    List,
 )
 
 
@@ -54,10 +56,10 @@ def stream_json(
 
         def writer(data):
             nonlocal first
-            if not first:
-                file.write(",\n")
+            # One write per record: json.dump would write token by token.
+            record = json.dumps(data)
+            file.write(record if first else ",\n" + record)
             first = False
-            json.dump(data, file)
             file.flush()
 
         yield writer
@@ -78,3 +80,20 @@ async def gather_dict(tasks: Dict[K, Awaitable[V]]) -> Dict[K, V]:
     return dict(
         await asyncio.gather(*(do_it(key, coro) for key, coro in tasks.items()))
     )
+
+
+async def check_call(cmd: List[str], **kwargs) -> None:
+    """Like `subprocess.check_call`, but doesn't block the event loop."""
+    proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+    returncode = await proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+async def check_output(cmd: List[str], **kwargs) -> bytes:
+    """Like `subprocess.check_output`, but doesn't block the event loop."""
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, **kwargs)
+    output, _ = await proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output)
+    return output